@@ -1,7 +1,12 @@
 from dotenv import load_dotenv
+
+# Load environment variables once, before src.db reads DATABASE_URL at import
+load_dotenv()
+
 from fastapi import FastAPI, Request, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.security import APIKeyHeader
+from contextlib import asynccontextmanager
 from datetime import datetime
 import os
 from .routes.deployments import router as deployment_router  # Updated import path
@@ -15,14 +20,21 @@ import secrets
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Load environment variables
-load_dotenv()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    db.ensure_schema()
+    yield
+    # Close pooled database connections when the worker shuts down
+    db.engine.dispose()
+
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Secure Deployment API",
     description="API for secure container deployments",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Security configurations
@@ -105,11 +117,21 @@ async def security_middleware(request: Request, call_next: Callable):
         logger.error(f"Error processing request from {client_ip}: {str(e)}")
         raise
 
+# Health timestamp, formatted at most once per second
+_health_timestamp = {"second": None, "value": ""}
+
+def get_health_timestamp() -> str:
+    second = int(time.time())
+    if _health_timestamp["second"] != second:
+        _health_timestamp["second"] = second
+        _health_timestamp["value"] = str(datetime.fromtimestamp(second))
+    return _health_timestamp["value"]
+
 @app.get("/health")
 async def health():
     return {
         "status": "healthy",
-        "timestamp": str(datetime.now()),
+        "timestamp": get_health_timestamp(),
         "version": "1.0.0"
     }
 
@@ -1,5 +1,7 @@
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.concurrency import run_in_threadpool
 from src.container_manager import SecureGCPContainerManager
+import asyncio
 import logging
 import re
 from pydantic import BaseModel, Field, field_validator
@@ -7,6 +9,22 @@ from pydantic import BaseModel, Field, field_validator
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+# In-flight deployments by client_id; concurrent POSTs for the same client share one
+_inflight_deployments = {}
+
+# Deployments running at once per worker; further requests wait for a free slot
+MAX_CONCURRENT_DEPLOYMENTS = 3
+_deployment_slots = None
+
+
+def _get_deployment_slots():
+    """Create the semaphore inside the serving loop; on Python 3.9 it binds to
+    the loop current at creation, which at import time is not the one uvicorn runs"""
+    global _deployment_slots
+    if _deployment_slots is None:
+        _deployment_slots = asyncio.Semaphore(MAX_CONCURRENT_DEPLOYMENTS)
+    return _deployment_slots
+
 
 class DeploymentRequest(BaseModel):
     client_id: str = Field(..., description="Client identifier")
@@ -20,11 +38,36 @@ class DeploymentRequest(BaseModel):
         return value.lower()
 
 
+def _run_deployment(client_id: str):
+    """Build, push and deploy synchronously; meant to run in a worker thread"""
+    manager = SecureGCPContainerManager(client_id)
+    return manager.deploy()
+
+
+async def _deploy(client_id: str):
+    async with _get_deployment_slots():
+        # Docker build/push and GCP calls block for minutes; keep them off the event loop
+        return await run_in_threadpool(_run_deployment, client_id)
+
+
+def _fetch_service_info(service_name: str):
+    manager = SecureGCPContainerManager("system")
+    return manager.cloud_run_service.get_service_info(service_name=service_name, region="us-central1")
+
+
 @router.post("/")
 async def create_deployment(request: DeploymentRequest):
+    client_id = request.client_id
     try:
-        manager = SecureGCPContainerManager(request.client_id)
-        return manager.deploy()
+        deployment = _inflight_deployments.get(client_id)
+        if deployment is None:
+            deployment = asyncio.ensure_future(_deploy(client_id))
+            _inflight_deployments[client_id] = deployment
+            deployment.add_done_callback(lambda _: _inflight_deployments.pop(client_id, None))
+        else:
+            logger.info(f"Joining in-flight deployment for client: {client_id}")
+        # Shield so one caller disconnecting doesn't cancel the deploy for the others
+        return await asyncio.shield(deployment)
     except Exception as e:
         logger.error(f"Deployment failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
@@ -33,9 +76,7 @@ async def create_deployment(request: DeploymentRequest):
 @router.get("/{service_name}")
 async def get_deployment(service_name: str):
     try:
-        manager = SecureGCPContainerManager("system")
-        service_info = manager.cloud_run_service.get_service_info(service_name=service_name, region="us-central1")
-        return service_info
+        return await run_in_threadpool(_fetch_service_info, service_name)
     except Exception as e:
         logger.error(f"Failed to get deployment: {str(e)}")
         raise HTTPException(status_code=404, detail=str(e))
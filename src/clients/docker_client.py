@@ -1,52 +1,120 @@
 import docker
+import io
 import logging
+import threading
+from ..utils.logging import setup_queue_logging
 
-logger = logging.getLogger(__name__)
+logger = setup_queue_logging(__name__)
+
+# Each push already uploads layers in parallel; more pushes just split the uplink
+MAX_CONCURRENT_PUSHES = 2
+_push_slots = threading.BoundedSemaphore(MAX_CONCURRENT_PUSHES)
+
+
+def split_reference(reference):
+    """Split an image reference into (repository, tag), defaulting the tag to latest
+
+    Registry ports are handled, so host:5000/image is a repository, not a tag.
+    """
+    repository, tag = docker.utils.parse_repository_tag(reference)
+    if "@" in reference:
+        raise ValueError(f"Expected a tag, not a digest reference: {reference}")
+    return repository, tag or "latest"
 
 
 class DockerClient:
     def __init__(self):
         self.client = docker.from_env()
 
-    def build_image(self, path, tag):
+    def build_image(self, context, tag, cache_from=None, labels=None, squash=False):
+        """Build an image from an uncompressed tar build context given as bytes"""
         try:
             logger.info(f"Building Docker image: {tag}")
-            self.client.images.build(path=str(path), tag=tag, rm=True)
+            # Consume the build log as it streams instead of collecting it in memory
+            stream = self.client.api.build(
+                fileobj=io.BytesIO(context),
+                custom_context=True,
+                tag=tag,
+                rm=True,
+                decode=True,
+                cache_from=cache_from,
+                labels=labels,
+                squash=squash,
+            )
+            image_id = None
+            # Progress lines are dropped unless debug logging is on
+            log_steps = logger.isEnabledFor(logging.DEBUG)
+            for chunk in stream:
+                if "error" in chunk:
+                    reason = chunk.get("errorDetail", {}).get("message") or chunk["error"]
+                    raise docker.errors.BuildError(reason, [chunk])
+                if "aux" in chunk:
+                    image_id = chunk["aux"].get("ID", image_id)
+                elif log_steps and "stream" in chunk:
+                    logger.debug(chunk["stream"].rstrip())
             logger.info("Docker image build completed")
+            return image_id
         except Exception as e:
             logger.error(f"Failed to build Docker image: {e}")
             raise
 
-    def push_image(self, tag):
+    def find_image_by_label(self, label, value):
+        """Id of a local image carrying the given label value, if there is one"""
+        images = self.client.api.images(filters={"label": f"{label}={value}"}, quiet=True)
+        return images[0] if images else None
+
+    def tag_image(self, image_id, tag):
+        repository, image_tag = split_reference(tag)
+        self.client.api.tag(image_id, repository, image_tag)
+
+    def image_exists(self, tag):
+        """Whether the image is already present in the local daemon"""
+        try:
+            self.client.api.inspect_image(tag)
+            return True
+        except docker.errors.ImageNotFound:
+            return False
+
+    def pull_image(self, tag, auth_config=None):
+        """Pull an image, returning False instead of raising if it is unavailable"""
+        try:
+            logger.info(f"Pulling Docker image: {tag}")
+            self.client.images.pull(tag, auth_config=auth_config)
+            return True
+        except Exception as e:
+            logger.warning(f"Failed to pull Docker image {tag}: {e}")
+            return False
+
+    def push_image(self, tag, auth_config=None):
         try:
             logger.info(f"Pushing Docker image: {tag}")
-            result = self.client.images.push(tag)
+            result = {}
+            with _push_slots:
+                # Push failures are reported inside the stream, not as an HTTP error
+                for chunk in self.client.api.push(tag, stream=True, decode=True, auth_config=auth_config):
+                    if "error" in chunk:
+                        raise docker.errors.APIError(chunk["error"])
+                    if "aux" in chunk:
+                        result = chunk["aux"]
             logger.info("Docker image pushed successfully")
             return result
         except Exception as e:
             logger.error(f"Failed to push Docker image: {e}")
             raise
     
-    """Aggressively clean Docker build cache and unused objects"""        
     def prune_builds(self):
+        """Remove stopped containers and dangling images
+
+        Tagged images and their parent layers stay, so the next build still
+        reuses the cached pip install and rippled layers.
+        """
         try:
-            # Remove build cache
-            self.client.api.prune_builds()
-            
             # Remove unused containers
             self.client.containers.prune()
-            
-            # Remove unused images
-            self.client.images.prune()
-            
-            # Force remove dangling images
-            dangling_images = self.client.images.list(filters={'dangling': True})
-            for image in dangling_images:
-                try:
-                    self.client.images.remove(image.id, force=True)
-                except Exception:
-                    pass
-                    
+
+            # Remove dangling images
+            self.client.images.prune(filters={"dangling": True})
+
         except Exception as e:
             logger.error(f"Error during Docker cleanup: {e}")
             raise
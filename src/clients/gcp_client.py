@@ -1,60 +1,151 @@
 import json
+import logging
 import os
+import threading
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+import google.auth.transport.requests
+import requests
+from google.api_core.future import polling
 from google.oauth2 import service_account
 from google.cloud import run_v2
 from google.cloud import artifactregistry_v1
+from google.cloud.artifactregistry_v1.services.artifact_registry.transports import ArtifactRegistryGrpcTransport
+from google.cloud.run_v2.services.services.transports import ServicesGrpcTransport
+
+logger = logging.getLogger(__name__)
+
+# Refresh access tokens this long before they expire
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Long-running operations are polled with a capped backoff. The library default
+# backs off to 20s between polls, which can add that much idle time per deploy
+LRO_POLLING = polling.DEFAULT_POLLING.with_delay(initial=1.0, maximum=5.0)
+
+# The channels live for the whole process and sit idle between deployments;
+# keepalive pings stop load balancers from silently dropping them
+GRPC_CHANNEL_OPTIONS = [
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 120000),
+    ("grpc.keepalive_timeout_ms", 20000),
+    ("grpc.keepalive_permit_without_calls", 1),
+]
+
+
+@lru_cache(maxsize=4)
+def _load_credentials(credentials_str):
+    """Parse and validate a service account key once per process
+
+    Every client built from the same key shares one Credentials object, and
+    with it the cached access token.
+    """
+    credentials_json = json.loads(credentials_str, strict=False)
+
+    # Validate required fields
+    required_fields = [
+        "type",
+        "project_id",
+        "private_key_id",
+        "private_key",
+        "client_email",
+        "client_id",
+        "auth_uri",
+        "token_uri",
+        "auth_provider_x509_cert_url",
+        "client_x509_cert_url",
+    ]
+
+    missing_fields = [field for field in required_fields if field not in credentials_json]
+    if missing_fields:
+        raise ValueError(
+            f"Missing required fields in credentials: {missing_fields}")
+
+    # Create credentials object with explicit scopes
+    credentials = service_account.Credentials.from_service_account_info(
+        credentials_json,
+        scopes=[
+            "https://www.googleapis.com/auth/cloud-platform",
+            "https://www.googleapis.com/auth/cloudplatformprojects",
+            "https://www.googleapis.com/auth/cloud-platform.read-only",
+        ],
+    )
+    return credentials_json["project_id"], credentials
 
 
 class GCPClient:
     def __init__(self):
+        self._refresh_lock = threading.Lock()
+        self._location_paths = {}
+        # Token refreshes reuse one pooled HTTPS session instead of a new connection each time
+        self._auth_request = google.auth.transport.requests.Request(session=requests.Session())
+
         # Load and validate credentials
         credentials_str = os.getenv("GCP_SERVICE_ACCOUNT_KEY")
         if not credentials_str:
             raise ValueError("GCP_SERVICE_ACCOUNT_KEY environment variable not set")
 
         try:
-            credentials_json = json.loads(credentials_str, strict=False)
-
-            # Validate required fields
-            required_fields = [
-                "type",
-                "project_id",
-                "private_key_id",
-                "private_key",
-                "client_email",
-                "client_id",
-                "auth_uri",
-                "token_uri",
-                "auth_provider_x509_cert_url",
-                "client_x509_cert_url",
-            ]
-
-            missing_fields = [field for field in required_fields if field not in credentials_json]
-            if missing_fields:
-                raise ValueError(
-                    f"Missing required fields in credentials: {missing_fields}")
-
-            self._project_id = credentials_json["project_id"]
-
-            # Create credentials object with explicit scopes
-            self.credentials = service_account.Credentials.from_service_account_info(
-                credentials_json,
-                scopes=[
-                    "https://www.googleapis.com/auth/cloud-platform",
-                    "https://www.googleapis.com/auth/cloudplatformprojects",
-                    "https://www.googleapis.com/auth/cloud-platform.read-only",
-                ],
+            self.project_id, self.credentials = _load_credentials(credentials_str)
+
+            # Initialize clients on explicitly configured, long-lived channels
+            run_channel = ServicesGrpcTransport.create_channel(
+                credentials=self.credentials, options=GRPC_CHANNEL_OPTIONS
             )
+            self.cloud_run_client = run_v2.ServicesClient(transport=ServicesGrpcTransport(channel=run_channel))
 
-            # Initialize clients with credentials
-            self.cloud_run_client = run_v2.ServicesClient(credentials=self.credentials)
-            self.artifact_client = artifactregistry_v1.ArtifactRegistryClient(credentials=self.credentials)
+            artifact_channel = ArtifactRegistryGrpcTransport.create_channel(
+                credentials=self.credentials, options=GRPC_CHANNEL_OPTIONS
+            )
+            self.artifact_client = artifactregistry_v1.ArtifactRegistryClient(
+                transport=ArtifactRegistryGrpcTransport(channel=artifact_channel)
+            )
 
         except json.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON in GCP_SERVICE_ACCOUNT_KEY: {str(e)}")
         except Exception as e:
             raise ValueError(f"Error initializing GCP client: {str(e)}")
 
-    @property
-    def project_id(self):
-        return self._project_id
+    def location_path(self, region):
+        """Resource parent for a region, e.g. projects/<project>/locations/us-central1"""
+        path = self._location_paths.get(region)
+        if path is None:
+            path = self._location_paths[region] = f"projects/{self.project_id}/locations/{region}"
+        return path
+
+    def get_access_token(self):
+        """Return a cached OAuth2 access token, refreshing it ahead of expiry"""
+        remaining = self._token_time_left()
+        if remaining is None or remaining <= timedelta(0):
+            with self._refresh_lock:
+                # Another thread may have refreshed while we were waiting
+                remaining = self._token_time_left()
+                if remaining is None or remaining <= timedelta(0):
+                    self._refresh_token()
+        elif remaining < TOKEN_REFRESH_MARGIN:
+            self._schedule_background_refresh()
+        return self.credentials.token
+
+    def _token_time_left(self):
+        if not self.credentials.token or not self.credentials.expiry:
+            return None
+        # google-auth stores expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        return self.credentials.expiry - now
+
+    def _refresh_token(self):
+        self.credentials.refresh(self._auth_request)
+
+    def _schedule_background_refresh(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            return  # A refresh is already in flight
+
+        def refresh():
+            try:
+                self._refresh_token()
+            except Exception as e:
+                logger.warning(f"Background token refresh failed: {e}")
+            finally:
+                self._refresh_lock.release()
+
+        threading.Thread(target=refresh, daemon=True).start()
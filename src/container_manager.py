@@ -1,7 +1,8 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-import random
-import string
-from pathlib import Path
+from functools import cached_property, lru_cache
+import secrets
+import time
 
 from .clients.gcp_client import GCPClient
 from .clients.docker_client import DockerClient
@@ -11,11 +12,40 @@ from .services.container_service import ContainerService
 from .utils.security import SecurityUtils
 from .utils.logging import setup_logging
 from . import db
-import shutil
 
 logger = setup_logging(__name__)
 
 
+@lru_cache(maxsize=1)
+def get_gcp_client():
+    """Process-wide GCP client so gRPC channels and tokens are reused across deployments"""
+    return GCPClient()
+
+
+@lru_cache(maxsize=1)
+def get_docker_client():
+    """Process-wide Docker client so the daemon connection is reused across deployments"""
+    return DockerClient()
+
+
+def deploy_many(client_ids, max_workers=8):
+    """Deploy several clients concurrently.
+
+    Returns a dict mapping each client_id to its deployment info, or to the
+    exception its deployment raised. A client_id listed more than once is
+    deployed once.
+    """
+    def deploy_one(client_id):
+        try:
+            return SecureGCPContainerManager(client_id).deploy()
+        except Exception as e:
+            return e
+
+    client_ids = list(dict.fromkeys(client_ids))
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        return dict(zip(client_ids, executor.map(deploy_one, client_ids)))
+
+
 class SecureGCPContainerManager:
     def __init__(self, client_id):
         self.client_id = client_id
@@ -23,22 +53,30 @@ class SecureGCPContainerManager:
         # Initialize security utils
         self.security = SecurityUtils(client_id)
 
-        # Initialize clients
-        self.gcp_client = GCPClient()
-        self.docker_client = DockerClient()
+        # Initialize clients; Docker-backed ones are created on first use
+        self.gcp_client = get_gcp_client()
 
         # Initialize services
-        self.artifact_service = ArtifactService(self.gcp_client, self.docker_client)
         self.cloud_run_service = CloudRunService(self.gcp_client)
-        self.container_service = ContainerService(self.docker_client)
 
         # Set up unique identifiers
         self._setup_identifiers()
 
+    @cached_property
+    def docker_client(self):
+        # Read-only paths (service info lookups) never need the Docker daemon
+        return get_docker_client()
+
+    @cached_property
+    def artifact_service(self):
+        return ArtifactService(self.gcp_client, self.docker_client)
+
+    @cached_property
+    def container_service(self):
+        return ContainerService(self.docker_client)
+
     def _setup_identifiers(self):
-        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        random_suffix = "".join(random.choices(string.ascii_lowercase + string.digits, k=4))
-        self.unique_id = f"{timestamp}-{random_suffix}"
+        self.unique_id = f"{int(time.time())}-{secrets.token_hex(2)}"
 
         # Set up deployment variables
         self.region = "us-central1"
@@ -60,21 +98,37 @@ class SecureGCPContainerManager:
 
     def deploy(self):
         """Main deployment orchestration"""
-        app_dir = None  # Track app directory for cleanup
         try:
             self._cleanup_docker()
             
             logger.info(
                 f"Starting secure deployment for client: {self.client_id}")
 
-            # Create app files
-            app_dir = self.container_service.create_app_files(self.unique_id)
-            logger.info(f"App files created at: {app_dir}")
-
-            # Build and push container
-            self.container_service.build_container(app_dir, self.image_tag)
-            self.artifact_service.create_repository(self.repository_name, self.region)
-            self.artifact_service.push_to_registry(self.image_tag, self.registry_location)
+            # Redeploys roll a new revision onto the client's existing service
+            previous = db.get_latest_deployment(self.client_id)
+            if previous:
+                self.service_name = previous.service_name
+
+            with ThreadPoolExecutor(max_workers=1) as executor:
+                # Registry setup only talks to GCP, so run it while the image builds
+                repository_future = executor.submit(
+                    self.artifact_service.create_repository, self.repository_name, self.region
+                )
+                # Build (from an in-memory context) and push container. Pull
+                # credentials are resolved up front; the push fetches its own,
+                # since a cold build can outlive the token
+                previous_image_tag = previous.image_tag if previous else None
+                pull_auth = self.artifact_service.get_registry_auth()
+                built = self.container_service.build_container(
+                    self.image_tag, previous_image_tag, pull_auth
+                )
+                repository_future.result()
+                self.artifact_service.push_to_registry(self.image_tag, self.registry_location)
+                if built:
+                    # Shares the new layers with other hosts; also needs fresh credentials
+                    self.container_service.push_build_cache(
+                        self.image_tag, self.artifact_service.get_registry_auth()
+                    )
 
             # Deploy to Cloud Run
             deployment_result = self.cloud_run_service.deploy(
@@ -82,10 +136,13 @@ class SecureGCPContainerManager:
                 self.image_tag,
                 self.region,
                 self.security.get_env_vars(),
+                update=previous is not None,
             )
 
-            # Generate deployment info
-            service_info = self.cloud_run_service.get_service_info(self.service_name, self.region)
+            # Generate deployment info from the Service returned by the rollout
+            service_info = self.cloud_run_service.describe_service(
+                self.service_name, self.region, deployment_result
+            )
 
             # Add database storage
             deployment_info = {
@@ -104,35 +161,13 @@ class SecureGCPContainerManager:
             logger.error(f"Secure deployment workflow failed: {e}")
             raise
 
-        finally:
-            if app_dir:
-                try:
-                    logger.info(f"Attempting to remove app files at: {app_dir}")
-                    self.remove_app_files(app_dir)
-                    logger.info(f"App files cleaned up successfully: {app_dir}")
-                except Exception as cleanup_error:
-                    logger.warning(
-                        f"Failed to remoe app files: {cleanup_error}")
-
     def _cleanup_docker(self):
-        """Aggressive Docker cleanup to free space"""
+        """Docker cleanup that frees space without discarding the layer cache"""
         try:
-            logger.info("Starting Docker cleanup")
-            self.docker_client.prune_builds()  # Add this method to your DockerClient class
-            logger.info("Completed Docker cleanup")
-        except Exception as e:
-            logger.warning(f"Docker cleanup failed: {e}")
-
-
-    def remove_app_files(self, app_dir):
-        """Remove app files after deployment"""
-        try:
-            path = Path(app_dir)
-            if path.exists() and path.is_dir():
-                shutil.rmtree(path)
-                logger.info(f"Removed app files at: {app_dir}")
+            # Skipped while another deployment is building; a later one catches up
+            if self.container_service.prune_if_idle():
+                logger.info("Completed Docker cleanup")
             else:
-                logger.warning(f"App directory not found or not a directory: {app_dir}")
+                logger.info("Skipping Docker cleanup while a build is running")
         except Exception as e:
-            logger.error(f"Error cleaning up app files at {app_dir}: {e}")
-            raise
+            logger.warning(f"Docker cleanup failed: {e}")
@@ -1,6 +1,7 @@
-from sqlalchemy import create_engine, Column, Integer, String, DateTime
+from sqlalchemy import create_engine, inspect, Column, Integer, String, DateTime
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import scoped_session, sessionmaker
 from datetime import datetime
 from contextlib import contextmanager
 import os
@@ -20,7 +21,8 @@ engine = create_engine(
     connect_args={"keepalives": 1, "keepalives_idle": 30, "keepalives_interval": 5, "keepalives_count": 5},
 )
 
-SessionLocal = sessionmaker(bind=engine)
+# One session per thread, reused across calls; objects stay readable after commit
+SessionLocal = scoped_session(sessionmaker(bind=engine, expire_on_commit=False))
 Base = declarative_base()
 
 
@@ -44,35 +46,82 @@ def get_db():
     try:
         yield db
     finally:
+        # Return the connection to the pool but keep the thread's session
         db.close()
 
 
+def _deployment_values(deployment_info, client_id):
+    return {
+        "service_name": deployment_info["service_name"],
+        "client_id": client_id,
+        "image_tag": deployment_info.get("image_tag", ""),
+        "status": "RUNNING",
+        "rpc_endpoint": deployment_info.get("rpc_endpoint", ""),
+        "ws_endpoint": deployment_info.get("ws_endpoint", ""),
+        "access_token": deployment_info.get("access_token", ""),
+    }
+
+
+def _upsert_deployments(rows):
+    """INSERT ... ON CONFLICT (service_name) DO UPDATE returning the stored rows"""
+    stmt = pg_insert(Deployment).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[Deployment.service_name],
+        set_={key: stmt.excluded[key] for key in rows[0] if key != "service_name"},
+    ).returning(Deployment)
+
+
 def save_deployment(deployment_info, client_id):
+    """Insert a deployment, or update the row when the service was redeployed"""
     with get_db() as db:
         try:
-            deployment = Deployment(
-                service_name=deployment_info["service_name"],
-                client_id=client_id,
-                image_tag=deployment_info.get("image_tag", ""),
-                status="RUNNING",
-                rpc_endpoint=deployment_info.get("rpc_endpoint", ""),
-                ws_endpoint=deployment_info.get("ws_endpoint", ""),
-                access_token=deployment_info.get("access_token", ""),
-            )
-            db.add(deployment)
+            stmt = _upsert_deployments([_deployment_values(deployment_info, client_id)])
+            # Single round-trip: the upsert returns the stored row
+            deployment = db.scalars(stmt, execution_options={"populate_existing": True}).one()
             db.commit()
-            db.refresh(deployment)
             return deployment
         except Exception as e:
             db.rollback()
             raise
 
 
+def save_deployments(deployment_infos, client_id):
+    """Save several deployments in one transaction, updating redeployed services"""
+    # A statement may touch each row only once, so the last entry per service wins
+    rows = {}
+    for info in deployment_infos:
+        values = _deployment_values(info, client_id)
+        rows[values["service_name"]] = values
+    if not rows:
+        return []
+
+    with get_db() as db:
+        try:
+            stmt = _upsert_deployments(list(rows.values()))
+            deployments = db.scalars(stmt, execution_options={"populate_existing": True}).all()
+            db.commit()
+            return deployments
+        except Exception as e:
+            db.rollback()
+            raise
+
+
 def get_deployment(service_name):
     with get_db() as db:
         return db.query(Deployment).filter_by(service_name=service_name).first()
 
 
+def get_latest_deployment(client_id):
+    """The client's most recent deployment, if any"""
+    with get_db() as db:
+        return (
+            db.query(Deployment)
+            .filter_by(client_id=client_id)
+            .order_by(Deployment.created_at.desc())
+            .first()
+        )
+
+
 def list_deployments(client_id):
     with get_db() as db:
         return db.query(Deployment).filter_by(client_id=client_id).all()
@@ -82,4 +131,7 @@ def init_db():
     Base.metadata.create_all(bind=engine)
 
 
-init_db()
+def ensure_schema():
+    """Create tables on first run; skips the DDL round-trips once they exist"""
+    if not inspect(engine).has_table(Deployment.__tablename__):
+        init_db()
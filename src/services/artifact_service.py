@@ -1,13 +1,25 @@
 import logging
-import requests
-import subprocess
+import threading
 import time
+from urllib.parse import quote
 import google.api_core.exceptions
 from google.cloud import artifactregistry_v1
-import jwt
+from ..clients.gcp_client import LRO_POLLING
 
 logger = logging.getLogger(__name__)
 
+# Repositories already confirmed to exist; they are never deleted by this service
+_known_repositories = {}
+
+# One lock per repository path, so only deploys targeting the same repository wait
+_repository_locks = {}
+_repository_locks_guard = threading.Lock()
+
+
+def _repository_lock(repository_path):
+    with _repository_locks_guard:
+        return _repository_locks.setdefault(repository_path, threading.Lock())
+
 
 class ArtifactService:
     def __init__(self, gcp_client, docker_client):
@@ -20,71 +32,59 @@ class ArtifactService:
         try:
             logger.info(f"Creating/checking Artifact Registry repository: {repository_name}")
 
-            parent = f"projects/{self.gcp_client.project_id}/locations/{region}"
+            parent = self.gcp_client.location_path(region)
             repository_path = f"{parent}/repositories/{repository_name}"
 
-            try:
-                # Try to get existing repository
-                request = artifactregistry_v1.GetRepositoryRequest(name=repository_path)
-                return self.artifact_client.get_repository(request=request)
-            except Exception:
-                # Create new repository if it doesn't exist
-                logger.info("Repository not found, creating new one...")
-                repository = artifactregistry_v1.Repository()
-                repository.format_ = artifactregistry_v1.Repository.Format.DOCKER
-
-                request = artifactregistry_v1.CreateRepositoryRequest(
-                    parent=parent, repository_id=repository_name, repository=repository
-                )
-                operation = self.artifact_client.create_repository(request=request)
-                return operation.result()
+            repository = _known_repositories.get(repository_path)
+            if repository is not None:
+                return repository
+
+            # Concurrent deploys to the same repository wait for a single check
+            # instead of each issuing one
+            with _repository_lock(repository_path):
+                if repository_path not in _known_repositories:
+                    _known_repositories[repository_path] = self._get_or_create_repository(
+                        parent, repository_name, repository_path
+                    )
+                return _known_repositories[repository_path]
 
         except Exception as e:
             logger.error(f"Failed to create repository: {e}")
             raise
 
-    def _get_docker_auth_token(self, registry):
-        # Generate short-lived token for Docker authentication
-        token = jwt.encode(
-            {
-                "iat": time.time(),
-                "exp": time.time() + 3600,
-                "aud": "https://oauth2.googleapis.com/token",
-                "iss": self.gcp_client.credentials.service_account_email,
-                "target_audience": registry,
-            },
-            self.gcp_client.credentials.private_key,
-            algorithm="RS256",
-        )
-
-        # Exchange JWT for OAuth2 token
-        auth_req = requests.Request()
-        token_response = auth_req.post(
-            "https://oauth2.googleapis.com/token",
-            data={
-                "grant_type": "urn:ietf:params:oauth:grant-type:jwt-bearer",
-                "assertion": token,
-            },
-        )
-
-        return token_response.json()["access_token"]
-
-    def push_to_registry(self, image_tag, registry_location):
+    def _get_or_create_repository(self, parent, repository_name, repository_path):
+        try:
+            # Try to get existing repository
+            request = artifactregistry_v1.GetRepositoryRequest(name=repository_path)
+            return self.artifact_client.get_repository(request=request)
+        except Exception:
+            # Create new repository if it doesn't exist
+            logger.info("Repository not found, creating new one...")
+            repository = artifactregistry_v1.Repository()
+            repository.format_ = artifactregistry_v1.Repository.Format.DOCKER
+
+            request = artifactregistry_v1.CreateRepositoryRequest(
+                parent=parent, repository_id=repository_name, repository=repository
+            )
+            operation = self.artifact_client.create_repository(request=request)
+            return operation.result(polling=LRO_POLLING)
+
+    def push_to_registry(self, image_tag, registry_location, auth_config=None):
         """Push container to Artifact Registry"""
         try:
             logger.info("Pushing container to Artifact Registry...")
 
-            # Get authentication token
-            auth_request = google.auth.transport.requests.Request()
-            self.gcp_client.credentials.refresh(auth_request)
-            token = self.gcp_client.credentials.token
-
-            # Configure Docker with correct registry URL
-            registry_url = f"https://{registry_location}"
-            self.docker_client.client.login(username="oauth2accesstoken", password=token, registry=registry_url)
+            if auth_config is None:
+                auth_config = self.get_registry_auth()
 
             # Push image
-            result = self.docker_client.push_image(image_tag)
+            result = self.docker_client.push_image(image_tag, auth_config=auth_config)
+
+            # A reported digest means the registry accepted the manifest; only
+            # fall back to polling the registry when the push stream didn't say so
+            if not result.get("Digest") and not self._wait_for_image(image_tag):
+                raise RuntimeError(f"Image {image_tag} not found in registry after push")
+
             logger.info(f"Successfully pushed image: {image_tag}")
             return result
 
@@ -92,50 +92,38 @@ class ArtifactService:
             logger.error(f"Failed to push container: {e}")
             raise
 
-    def _configure_docker_auth(self, registry_location):
-        """Configure Docker authentication using GCP credentials"""
-        try:
-            # Create auth request
-            auth_request = google.auth.transport.requests.Request()
-
-            # Refresh credentials if needed
-            self.gcp_client.credentials.refresh(auth_request)
-
-            # Get the token
-            token = self.gcp_client.credentials.token
+    def get_registry_auth(self):
+        """Registry credentials for the Docker API, built from the cached GCP token"""
+        # Sent with each pull and push, so the daemon never needs a separate login round-trip
+        return {"username": "oauth2accesstoken", "password": self.gcp_client.get_access_token()}
 
-            # Configure Docker client with token
-            self.docker_client.client.login(username="oauth2accesstoken", password=token, registry=registry_location)
-
-            logger.info(
-                f"Successfully configured Docker authentication for {registry_location}")
-
-        except Exception as e:
-            logger.error(f"Failed to configure Docker authentication: {e}")
-            raise
+    def _wait_for_image(self, image_tag, attempts=5):
+        """Poll for the pushed image with exponential backoff (1s, 2s, 4s, 8s)"""
+        for attempt in range(attempts):
+            if self._verify_image_exists(image_tag):
+                return True
+            if attempt < attempts - 1:
+                time.sleep(min(2**attempt, 8))
+        return False
 
     def _verify_image_exists(self, image_tag):
         try:
             # Parse repository and image details from tag
-            project = self.gcp_client.project_id
             repository = image_tag.split("/")[-2]
-            image = image_tag.split("/")[-1]
+            image, tag = image_tag.split("/")[-1].rsplit(":", 1)
 
             # Get the parent path for the repository
             location = image_tag.split("-docker.pkg.dev")[0].split("/")[-1]
-            parent = f"projects/{project}/locations/{location}/repositories/{repository}"
+            parent = f"{self.gcp_client.location_path(location)}/repositories/{repository}"
 
-            # List images in repository
-            request = self.gcp_client.artifact_client.list_docker_images(parent=parent)
-
-            # Check if our image exists
+            # Look the tag up directly instead of paging through every image;
+            # package ids are URL-encoded image names
+            package = quote(image, safe="")
+            request = artifactregistry_v1.GetTagRequest(name=f"{parent}/packages/{package}/tags/{tag}")
             try:
-                for image_item in request:
-                    if image in image_item.uri:
-                        return True
-                return False
-            except Exception as e:
-                logger.error(f"Error checking image existence: {e}")
+                self.artifact_client.get_tag(request=request)
+                return True
+            except google.api_core.exceptions.NotFound:
                 return False
 
         except Exception as e:
@@ -1,15 +1,24 @@
 import logging
+import threading
+import google.api_core.exceptions
+from cachetools import TTLCache
 from google.cloud import run_v2
 from google.iam.v1 import iam_policy_pb2, policy_pb2
+from ..clients.gcp_client import LRO_POLLING
 
 logger = logging.getLogger(__name__)
 
+# Service info changes on the timescale of deploys; absorb polling clients
+SERVICE_INFO_TTL_SECONDS = 5
+_service_info_cache = TTLCache(maxsize=1024, ttl=SERVICE_INFO_TTL_SECONDS)
+_service_info_lock = threading.Lock()
+
 
 class CloudRunService:
     def __init__(self, gcp_client):
         self.gcp_client = gcp_client
 
-    def deploy(self, service_name, image_tag, region, env_vars):
+    def deploy(self, service_name, image_tag, region, env_vars, update=False):
         try:
             """Deploy container to Cloud Run with security configurations"""
             logger.info(f"Deploying secure service to Cloud Run: {service_name}")
@@ -45,15 +54,28 @@ class CloudRunService:
             # vpc_access.egress = run_v2.VpcAccess.VpcEgress.PRIVATE_RANGES_ONLY
             # service.template.vpc_access = vpc_access
 
+            if update:
+                try:
+                    # Roll out a new revision; the service keeps its URL and IAM policy
+                    service.name = f"{self.gcp_client.location_path(region)}/services/{service_name}"
+                    request = run_v2.UpdateServiceRequest(service=service)
+                    operation = self.gcp_client.cloud_run_client.update_service(request=request)
+                    result = operation.result(polling=LRO_POLLING)
+                    logger.info(f"Secure service updated successfully: {result.uri}")
+                    return result
+                except google.api_core.exceptions.NotFound:
+                    logger.info(f"Service {service_name} no longer exists, creating it")
+                    service.name = ""
+
             # Create the service
             request = run_v2.CreateServiceRequest(
-                parent=f"projects/{self.gcp_client.project_id}/locations/{region}",
+                parent=self.gcp_client.location_path(region),
                 service_id=service_name,
                 service=service,
             )
 
             operation = self.gcp_client.cloud_run_client.create_service(request=request)
-            result = operation.result()
+            result = operation.result(polling=LRO_POLLING)
 
             # Set IAM policy
             self._set_service_iam_policy(service_name, region)
@@ -66,26 +88,38 @@ class CloudRunService:
             raise
 
     def get_service_info(self, service_name, region):
+        cache_key = (self.gcp_client.project_id, region, service_name)
+        with _service_info_lock:
+            cached = _service_info_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
         try:
-            request = run_v2.GetServiceRequest(name=f"projects/{self.gcp_client.project_id}/locations/{region}/services/{service_name}")
+            request = run_v2.GetServiceRequest(name=f"{self.gcp_client.location_path(region)}/services/{service_name}")
 
             service = self.gcp_client.cloud_run_client.get_service(request=request)
-
-            return {
-                "service_name": service_name,
-                "rpc_endpoint": f"{service.uri}/",
-                "ws_endpoint": f"wss://{service.uri.split('https://')[1]}/ws",
-                "status": service.latest_ready_revision,
-                "connection_examples": self._generate_connection_examples(service.uri),
-            }
+            return self.describe_service(service_name, region, service)
 
         except Exception as e:
             logger.error(f"Failed to retrieve service info: {e}")
             raise
 
+    def describe_service(self, service_name, region, service):
+        """Build service info from a Service message the caller already has"""
+        service_info = {
+            "service_name": service_name,
+            "rpc_endpoint": f"{service.uri}/",
+            "ws_endpoint": f"wss://{service.uri.split('https://')[1]}/ws",
+            "status": service.latest_ready_revision,
+            "connection_examples": self._generate_connection_examples(service.uri),
+        }
+        with _service_info_lock:
+            _service_info_cache[(self.gcp_client.project_id, region, service_name)] = service_info
+        return service_info
+
     def _set_service_iam_policy(self, service_name, region):
         try:
-            service_path = f"projects/{self.gcp_client.project_id}/locations/{region}/services/{service_name}"
+            service_path = f"{self.gcp_client.location_path(region)}/services/{service_name}"
 
             binding = policy_pb2.Binding(role="roles/run.invoker", members=["allUsers"])
 
@@ -1,51 +1,229 @@
+import hashlib
+import io
 import logging
-from pathlib import Path
+import os
+import tarfile
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from ..clients.docker_client import split_reference
 from ..templates import TemplateManager
 
 logger = logging.getLogger(__name__)
 
+# Image label holding the sha256 of the build context the image was built from
+DIGEST_LABEL = "factory.digest"
+
+# Repository of the shared image holding system packages and Python requirements
+BASE_IMAGE_REPOSITORY = "docker-factory/base"
+
+# Base build context file name -> template it is rendered from
+BASE_FILES = {
+    "Dockerfile": "base.dockerfile",
+    "requirements.txt": "requirements.txt",
+}
+
+# App build context file name -> template it is rendered from
+APP_FILES = {
+    "app.py": "app.py",
+    "Dockerfile": "dockerfile",
+    "rippled.cfg": "rippled.cfg",
+    "validators.txt": "validators.txt",
+    "supervisord.conf": "supervisord.conf",
+}
+
+# Squash the per-app layers into one on top of the base image. Needs a daemon
+# with experimental features enabled, so it is opt-in
+SQUASH_BUILDS = os.getenv("DOCKER_SQUASH_BUILDS", "").lower() in ("1", "true", "yes")
+
+# Optional registry image (e.g. <region>-docker.pkg.dev/<project>/<repo>/cache:latest)
+# shared by every host as a layer cache source; unset disables remote caching
+CACHE_REF = os.getenv("DOCKER_FACTORY_CACHE_REF")
+if CACHE_REF:
+    # Pin the tag so the pull, tag and push all address the same image
+    CACHE_REF = "{}:{}".format(*split_reference(CACHE_REF))
+
+# One lock per build context digest: concurrent deployments of the same context
+# build it once and the rest retag the result, while other contexts proceed
+_build_locks = {}
+_build_locks_guard = threading.Lock()
+
+# Pruning removes stopped containers and untagged images, which is exactly what
+# a classic build in progress leaves between steps; prunes and builds in this
+# process therefore never overlap
+_docker_activity = threading.Condition()
+_active_builds = 0
+_pruning = False
+
+
+@contextmanager
+def _building():
+    global _active_builds
+    with _docker_activity:
+        while _pruning:
+            _docker_activity.wait()
+        _active_builds += 1
+    try:
+        yield
+    finally:
+        with _docker_activity:
+            _active_builds -= 1
+            _docker_activity.notify_all()
+
+
+def _pack_context(files):
+    """Pack {name: bytes} into an uncompressed tar, returning it with its sha256"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode="w") as tar:
+        for name, content in files.items():
+            info = tarfile.TarInfo(name)
+            info.size = len(content)
+            info.mode = 0o644
+            info.mtime = 0  # Fixed metadata keeps the context byte-for-byte reproducible
+            tar.addfile(info, io.BytesIO(content))
+    context = buffer.getvalue()
+    return context, hashlib.sha256(context).hexdigest()
+
+
+def _build_lock(digest):
+    with _build_locks_guard:
+        return _build_locks.setdefault(digest, threading.Lock())
+
+
+@lru_cache(maxsize=1)
+def _base_context():
+    """Base image context, digest and tag; the tag changes whenever its inputs do"""
+    template_manager = TemplateManager()
+    context, digest = _pack_context({
+        name: template_manager.render_template(template).encode("utf-8")
+        for name, template in BASE_FILES.items()
+    })
+    return context, digest, f"{BASE_IMAGE_REPOSITORY}:{digest[:12]}"
+
+
+@lru_cache(maxsize=1)
+def _render_app_files():
+    """Render the app templates once per process; their content never varies per deployment"""
+    template_manager = TemplateManager()
+    base_image = _base_context()[2]
+    return {
+        name: template_manager.render_template(template, base_image=base_image).encode("utf-8")
+        for name, template in APP_FILES.items()
+    }
+
+
+@lru_cache(maxsize=1)
+def _build_context():
+    """Pack the rendered app files into a tar once per process, with its digest"""
+    return _pack_context(_render_app_files())
+
+
 class ContainerService:
     def __init__(self, docker_client):
         self.docker_client = docker_client
-        self.template_manager = TemplateManager()
-        # Create base data directory if it doesn't exist
-        self.base_data_dir = Path("./data")
-        self.base_data_dir.mkdir(exist_ok=True)
-
-    def create_app_files(self, unique_id):
-        """Create necessary application files with security middleware"""
-        app_dir = self.base_data_dir / f"secure-app-{unique_id}"
-        app_dir.mkdir(exist_ok=True)
-        # Create files from templates
-        self.template_manager.write_template("app.py", app_dir / "app.py")
-        self.template_manager.write_template("requirements.txt", app_dir / "requirements.txt")
-        self.template_manager.write_template("dockerfile", app_dir / "Dockerfile")
-        
-        self.template_manager.write_template("rippled.cfg", app_dir / "rippled.cfg")
-        self.template_manager.write_template("validators.txt", app_dir / "validators.txt")
-        self.template_manager.write_template("supervisord.conf", app_dir / "supervisord.conf")
-        return app_dir
-
-    def build_container(self, app_dir, image_tag):
-        """Build container using Docker SDK with security best practices"""
+
+    def create_build_context(self):
+        """The in-memory tar build context and its sha256 hex digest"""
+        return _build_context()
+
+    def prune_if_idle(self):
+        """Prune Docker leftovers unless a build is running; returns whether it pruned"""
+        global _pruning
+        with _docker_activity:
+            if _active_builds or _pruning:
+                return False
+            _pruning = True
+        try:
+            self.docker_client.prune_builds()
+        finally:
+            with _docker_activity:
+                _pruning = False
+                _docker_activity.notify_all()
+        return True
+
+    def ensure_base_image(self, cache_from=None):
+        """Build the shared base image unless the daemon already has it"""
+        context, digest, tag = _base_context()
+        if self.docker_client.image_exists(tag):
+            return tag
+        with _build_lock(digest):
+            # Another deployment may have built it while we waited
+            if not self.docker_client.image_exists(tag):
+                logger.info(f"Building base image {tag}")
+                self.docker_client.build_image(
+                    context, tag, cache_from=cache_from, labels={DIGEST_LABEL: digest}
+                )
+        return tag
+
+    def _reuse_image(self, digest, image_tag):
+        """Tag a local image built from the same context; False when there is none"""
+        existing = self.docker_client.find_image_by_label(DIGEST_LABEL, digest)
+        if not existing:
+            return False
+        logger.info(f"Reusing image {existing} built from the same context")
+        self.docker_client.tag_image(existing, image_tag)
+        return True
+
+    def _pull_remote_cache(self, auth_config):
+        """Fetch the shared cache image; False when it is not configured or unavailable"""
+        return bool(CACHE_REF) and self.docker_client.pull_image(CACHE_REF, auth_config)
+
+    def push_build_cache(self, image_tag, auth_config=None):
+        """Publish a freshly built image as the shared cache; failures only cost cache hits"""
+        if not CACHE_REF:
+            return
         try:
-            logger.info("Building secure container image...")
-            self.docker_client.build_image(path=str(app_dir), tag=image_tag)
+            self.docker_client.tag_image(image_tag, CACHE_REF)
+            self.docker_client.push_image(CACHE_REF, auth_config)
         except Exception as e:
-            logger.error(f"Failed to build container: {e}")
-            raise
+            logger.warning(f"Failed to update remote build cache {CACHE_REF}: {e}")
+
+    def build_container(self, image_tag, previous_image_tag=None, auth_config=None):
+        """Build container using Docker SDK with security best practices
 
-    def remove_app_files(self, unique_id):
-        """Remove application files and clean up the directory"""
-        app_dir = self.base_data_dir / f"secure-app-{unique_id}"
+        Returns True when a new image was built, False when an image built from
+        the same context was retagged instead.
+        """
         try:
-            if app_dir.exists() and app_dir.is_dir():
-                for file in app_dir.iterdir():
-                    file.unlink()  # Remove each file
-                app_dir.rmdir()  # Remove the directory itself
-                logger.info(f"Application files for {unique_id} removed successfully.")
-            else:
-                logger.warning(f"Application directory {app_dir} does not exist or is not a directory.")
+            with _building():
+                logger.info("Building secure container image...")
+                context, digest = self.create_build_context()
+
+                # An identical context was already built here; retagging is all that is needed
+                if self._reuse_image(digest, image_tag):
+                    return False
+
+                # Cache sources are fetched before taking the build lock, so network
+                # pulls never hold up deployments that only need a retag
+                cache_from = []
+                if self._pull_remote_cache(auth_config):
+                    # Another host may have built this exact context
+                    if self._reuse_image(digest, image_tag):
+                        return False
+                    cache_from.append(CACHE_REF)
+
+                # The client's previous image was built on the same base, so it
+                # carries the apt, rippled and pip layers as well as the app ones;
+                # only pull it when the daemon no longer has it locally
+                if previous_image_tag and (
+                    self.docker_client.image_exists(previous_image_tag)
+                    or self.docker_client.pull_image(previous_image_tag, auth_config)
+                ):
+                    cache_from.append(previous_image_tag)
+
+                with _build_lock(digest):
+                    # A concurrent deployment may have built it while we waited
+                    if self._reuse_image(digest, image_tag):
+                        return False
+                    self.ensure_base_image(cache_from or None)
+                    self.docker_client.build_image(
+                        context,
+                        image_tag,
+                        cache_from=cache_from or None,
+                        labels={DIGEST_LABEL: digest},
+                        squash=SQUASH_BUILDS,
+                    )
+                return True
         except Exception as e:
-            logger.error(f"Failed to remove application files for {unique_id}: {e}")
-            raise
\ No newline at end of file
+            logger.error(f"Failed to build container: {e}")
+            raise
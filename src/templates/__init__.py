@@ -1,20 +1,29 @@
 import os
+from functools import lru_cache
 from pathlib import Path
 from string import Template
 
 
+@lru_cache(maxsize=None)
+def _read_template(template_path: Path) -> Template:
+    with open(template_path, "r") as f:
+        return Template(f.read())
+
+
 class TemplateManager:
     def __init__(self):
         self.template_dir = Path(__file__).parent
 
     def load_template(self, template_name: str) -> Template:
-        """Load a template file and return a Template object."""
+        """Load a template file and return a Template object.
+
+        Templates ship with the package, so each file is read once per process.
+        """
         template_path = self.template_dir / template_name
         if not template_path.exists():
             raise FileNotFoundError(f"Template {template_name} not found")
 
-        with open(template_path, "r") as f:
-            return Template(f.read())
+        return _read_template(template_path)
 
     def render_template(self, template_name: str, **kwargs) -> str:
         """Render a template with the given kwargs."""
@@ -1,4 +1,8 @@
+import atexit
 import logging
+import logging.handlers
+import queue
+import threading
 
 
 def setup_logging(name):
@@ -9,3 +13,42 @@ def setup_logging(name):
             format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
         )
     return logger
+
+
+class _RootForwardingHandler(logging.Handler):
+    """Hand records to whatever handlers the root logger has when they arrive"""
+
+    def handle(self, record):
+        for handler in logging.getLogger().handlers:
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+
+_log_queue = queue.SimpleQueue()
+_listener = None
+_listener_lock = threading.Lock()
+
+
+def _start_listener():
+    global _listener
+    with _listener_lock:
+        if _listener is None:
+            _listener = logging.handlers.QueueListener(_log_queue, _RootForwardingHandler())
+            _listener.start()
+            atexit.register(_listener.stop)
+
+
+def setup_queue_logging(name):
+    """Logger whose records are written by a background thread
+
+    Handler formatting and I/O run under per-handler locks; moving them off
+    the caller keeps chatty code paths (e.g. concurrent builds) from
+    contending on them.
+    """
+    logger = setup_logging(name)
+    if not any(isinstance(h, logging.handlers.QueueHandler) for h in logger.handlers):
+        logger.addHandler(logging.handlers.QueueHandler(_log_queue))
+        logger.propagate = False
+        _start_listener()
+    return logger
@@ -1,12 +1,20 @@
+import json
 import secrets
-import jwt
 from datetime import datetime, timedelta, timezone
+from jwt.algorithms import HMACAlgorithm
+from jwt.utils import base64url_encode
+
+# Every token carries the same header, so encode it once
+_JWT_HEADER_SEGMENT = base64url_encode(json.dumps({"alg": "HS256", "typ": "JWT"}, separators=(",", ":")).encode())
 
 
 class SecurityUtils:
     def __init__(self, client_id):
         self.client_id = client_id
         self._jwt_secret = secrets.token_urlsafe(64)
+        # Prepare the HMAC key once instead of on every jwt.encode call
+        self._jwt_algorithm = HMACAlgorithm(HMACAlgorithm.SHA256)
+        self._jwt_key = self._jwt_algorithm.prepare_key(self._jwt_secret)
         self.api_key = secrets.token_urlsafe(32)
 
     @property
@@ -22,11 +30,15 @@ class SecurityUtils:
         }
 
     def generate_access_token(self, expiration_minutes=60):
-        """Generate JWT access token using stored secret"""
+        """Generate HS256 JWT access token using stored secret"""
+        now = datetime.now(timezone.utc)
         payload = {
             "client_id": self.client_id,
-            "exp": datetime.now(timezone.utc) + timedelta(minutes=expiration_minutes),
-            "iat": datetime.now(timezone.utc),
+            "exp": int((now + timedelta(minutes=expiration_minutes)).timestamp()),
+            "iat": int(now.timestamp()),
             "jti": secrets.token_hex(16),
         }
-        return jwt.encode(payload, self._jwt_secret, algorithm="HS256")
+        payload_segment = base64url_encode(json.dumps(payload, separators=(",", ":")).encode())
+        signing_input = _JWT_HEADER_SEGMENT + b"." + payload_segment
+        signature = self._jwt_algorithm.sign(signing_input, self._jwt_key)
+        return (signing_input + b"." + base64url_encode(signature)).decode()
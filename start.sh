@@ -3,4 +3,17 @@
 # Start Docker daemon directly with specific settings
 
 # Start your application
-exec uvicorn main:app --host 0.0.0.0 --port 8000
\ No newline at end of file
+# A single worker by default: the rate limit, deployment and build/push caps
+# and in-flight deploy coalescing are all per worker process
+WORKERS="${WEB_CONCURRENCY:-1}"
+
+# Each worker would otherwise generate its own random API key
+if [ "$WORKERS" -gt 1 ] && [ -z "$API_KEY" ]; then
+    echo "API_KEY must be set when running more than one worker (WEB_CONCURRENCY=$WORKERS)" >&2
+    exit 1
+fi
+
+exec uvicorn main:app --host 0.0.0.0 --port 8000 \
+    --loop uvloop --http httptools \
+    --workers "$WORKERS" \
+    --limit-concurrency 256
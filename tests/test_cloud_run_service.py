@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import Mock
+import google.api_core.exceptions
+from src.services.cloud_run_service import CloudRunService
+
+LOCATION = "projects/test-project/locations/us-central1"
+ENV_VARS = {"JWT_SECRET": "secret", "CLIENT_ID": "client"}
+
+
+class TestCloudRunServiceDeploy(unittest.TestCase):
+    def setUp(self):
+        self.gcp_client = Mock()
+        self.gcp_client.location_path.return_value = LOCATION
+        self.run_client = self.gcp_client.cloud_run_client
+        self.service = CloudRunService(self.gcp_client)
+
+    def test_first_deploy_creates_service_and_sets_iam_policy(self):
+        result = self.service.deploy("secure-app-1", "image:1", "us-central1", ENV_VARS)
+
+        request = self.run_client.create_service.call_args.kwargs["request"]
+        self.assertEqual(request.parent, LOCATION)
+        self.assertEqual(request.service_id, "secure-app-1")
+        self.assertEqual(request.service.template.containers[0].image, "image:1")
+        self.run_client.update_service.assert_not_called()
+        self.run_client.set_iam_policy.assert_called_once()
+        self.assertIs(result, self.run_client.create_service.return_value.result.return_value)
+
+    def test_redeploy_updates_existing_service(self):
+        result = self.service.deploy("secure-app-1", "image:2", "us-central1", ENV_VARS, update=True)
+
+        request = self.run_client.update_service.call_args.kwargs["request"]
+        self.assertEqual(request.service.name, f"{LOCATION}/services/secure-app-1")
+        self.assertEqual(request.service.template.containers[0].image, "image:2")
+        self.run_client.create_service.assert_not_called()
+        # The service keeps its IAM policy across revisions
+        self.run_client.set_iam_policy.assert_not_called()
+        self.assertIs(result, self.run_client.update_service.return_value.result.return_value)
+
+    def test_update_of_missing_service_falls_back_to_create(self):
+        self.run_client.update_service.side_effect = google.api_core.exceptions.NotFound("gone")
+
+        result = self.service.deploy("secure-app-1", "image:2", "us-central1", ENV_VARS, update=True)
+
+        request = self.run_client.create_service.call_args.kwargs["request"]
+        self.assertEqual(request.service_id, "secure-app-1")
+        # CreateService rejects a request whose service already carries a name
+        self.assertEqual(request.service.name, "")
+        self.run_client.set_iam_policy.assert_called_once()
+        self.assertIs(result, self.run_client.create_service.return_value.result.return_value)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,21 +1,97 @@
 import unittest
 from unittest.mock import Mock, patch
-from src.container_manager import SecureGCPContainerManager
+from src.container_manager import SecureGCPContainerManager, deploy_many
 
 
 class TestSecureGCPContainerManager(unittest.TestCase):
     def setUp(self):
         self.client_id = "test@example.com"
 
-    @patch("src.clients.gcp_client.GCPClient")
-    @patch("src.clients.docker_client.DockerClient")
+    @patch("src.container_manager.get_gcp_client")
+    @patch("src.container_manager.get_docker_client")
     def test_initialization(self, mock_docker, mock_gcp):
         manager = SecureGCPContainerManager(self.client_id)
         self.assertEqual(manager.client_id, self.client_id)
         self.assertIsNotNone(manager.unique_id)
 
+    @patch("src.container_manager.get_gcp_client")
+    def test_unique_id_format(self, mock_gcp):
+        manager = SecureGCPContainerManager(self.client_id)
+        timestamp, suffix = manager.unique_id.split("-")
+        self.assertTrue(timestamp.isdigit())
+        self.assertRegex(suffix, r"^[0-9a-f]{4}$")
+        self.assertEqual(manager.service_name, f"secure-app-{manager.unique_id}")
+
     # Add more tests as needed
 
 
+@patch("src.container_manager.db")
+@patch("src.container_manager.get_gcp_client")
+class TestDeploy(unittest.TestCase):
+    def _manager(self):
+        manager = SecureGCPContainerManager("test-client")
+        manager.container_service = Mock()
+        manager.artifact_service = Mock()
+        manager.cloud_run_service = Mock()
+        manager.cloud_run_service.describe_service.return_value = {"service_name": manager.service_name}
+        return manager
+
+    def test_redeploy_reuses_previous_service_and_image(self, mock_gcp, mock_db):
+        mock_db.get_latest_deployment.return_value = Mock(
+            service_name="secure-app-old", image_tag="registry/secure-app:old"
+        )
+        manager = self._manager()
+
+        manager.deploy()
+
+        build_args = manager.container_service.build_container.call_args.args
+        self.assertEqual(build_args[1], "registry/secure-app:old")
+        deploy_call = manager.cloud_run_service.deploy.call_args
+        self.assertEqual(deploy_call.args[0], "secure-app-old")
+        self.assertTrue(deploy_call.kwargs["update"])
+        mock_db.save_deployment.assert_called_once()
+
+    def test_first_deploy_creates_new_service(self, mock_gcp, mock_db):
+        mock_db.get_latest_deployment.return_value = None
+        manager = self._manager()
+        service_name = manager.service_name
+
+        manager.deploy()
+
+        self.assertIsNone(manager.container_service.build_container.call_args.args[1])
+        deploy_call = manager.cloud_run_service.deploy.call_args
+        self.assertEqual(deploy_call.args[0], service_name)
+        self.assertFalse(deploy_call.kwargs["update"])
+
+
+class TestDeployMany(unittest.TestCase):
+    @patch("src.container_manager.SecureGCPContainerManager")
+    def test_collects_results_and_errors_per_client(self, mock_manager):
+        error = RuntimeError("build failed")
+
+        def make_manager(client_id):
+            manager = Mock()
+            if client_id == "bad":
+                manager.deploy.side_effect = error
+            else:
+                manager.deploy.return_value = {"client": client_id}
+            return manager
+
+        mock_manager.side_effect = make_manager
+
+        results = deploy_many(["a", "bad", "b"])
+
+        self.assertEqual(results, {"a": {"client": "a"}, "bad": error, "b": {"client": "b"}})
+
+    @patch("src.container_manager.SecureGCPContainerManager")
+    def test_deploys_duplicate_client_ids_once(self, mock_manager):
+        mock_manager.return_value.deploy.return_value = {}
+
+        results = deploy_many(["a", "b", "a"])
+
+        self.assertEqual(list(results), ["a", "b"])
+        self.assertEqual(sorted(c.args[0] for c in mock_manager.call_args_list), ["a", "b"])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+from unittest.mock import Mock
+from src.services import container_service
+from src.services.container_service import ContainerService
+
+
+class TestPruneIfIdle(unittest.TestCase):
+    def setUp(self):
+        self.docker_client = Mock()
+        self.service = ContainerService(self.docker_client)
+
+    def test_prunes_when_no_build_is_running(self):
+        self.assertTrue(self.service.prune_if_idle())
+        self.docker_client.prune_builds.assert_called_once()
+
+    def test_skips_while_a_build_is_running(self):
+        with container_service._building():
+            self.assertFalse(self.service.prune_if_idle())
+        self.docker_client.prune_builds.assert_not_called()
+
+    def test_prune_during_build_does_not_run_mid_build(self):
+        # A prune requested from inside build_container's build step must be skipped
+        def build_image(*args, **kwargs):
+            self.assertFalse(self.service.prune_if_idle())
+
+        self.docker_client.find_image_by_label.return_value = None
+        self.docker_client.image_exists.return_value = True
+        self.docker_client.build_image.side_effect = build_image
+
+        self.assertTrue(self.service.build_container("app:1"))
+        self.docker_client.prune_builds.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,47 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+from fastapi import HTTPException
+from api.routes import deployments
+from api.routes.deployments import DeploymentRequest, create_deployment
+
+
+class TestCreateDeploymentCoalescing(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        # Each test runs on its own event loop
+        deployments._deployment_slots = None
+        deployments._inflight_deployments.clear()
+
+    @patch("api.routes.deployments._run_deployment")
+    async def test_concurrent_requests_share_one_deployment(self, mock_run):
+        def run(client_id):
+            time.sleep(0.05)
+            return {"client_id": client_id}
+
+        mock_run.side_effect = run
+        request = DeploymentRequest(client_id="client-a")
+
+        first, second = await asyncio.gather(create_deployment(request), create_deployment(request))
+
+        mock_run.assert_called_once_with("client-a")
+        self.assertEqual(first, {"client_id": "client-a"})
+        self.assertIs(first, second)
+        self.assertEqual(deployments._inflight_deployments, {})
+
+    @patch("api.routes.deployments._run_deployment")
+    async def test_failed_deployment_is_not_reused_by_retry(self, mock_run):
+        mock_run.side_effect = [RuntimeError("build failed"), {"client_id": "client-a"}]
+        request = DeploymentRequest(client_id="client-a")
+
+        with self.assertRaises(HTTPException) as raised:
+            await create_deployment(request)
+        self.assertEqual(raised.exception.status_code, 500)
+        self.assertEqual(deployments._inflight_deployments, {})
+
+        self.assertEqual(await create_deployment(request), {"client_id": "client-a"})
+        self.assertEqual(mock_run.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,31 @@
+import unittest
+from unittest.mock import Mock, patch
+from src.clients.docker_client import DockerClient, split_reference
+
+
+class TestSplitReference(unittest.TestCase):
+    def test_explicit_tag(self):
+        self.assertEqual(split_reference("registry/cache:build"), ("registry/cache", "build"))
+
+    def test_missing_tag_defaults_to_latest(self):
+        self.assertEqual(split_reference("registry/cache"), ("registry/cache", "latest"))
+
+    def test_registry_port_is_not_a_tag(self):
+        self.assertEqual(split_reference("host:5000/cache"), ("host:5000/cache", "latest"))
+        self.assertEqual(split_reference("host:5000/cache:build"), ("host:5000/cache", "build"))
+
+    def test_digest_reference_is_rejected(self):
+        with self.assertRaises(ValueError):
+            split_reference("registry/cache@sha256:abc")
+
+
+class TestTagImage(unittest.TestCase):
+    @patch("src.clients.docker_client.docker.from_env")
+    def test_tags_with_parsed_repository(self, mock_from_env):
+        client = DockerClient()
+        client.tag_image("sha256:1234", "host:5000/cache")
+        mock_from_env.return_value.api.tag.assert_called_once_with("sha256:1234", "host:5000/cache", "latest")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+import logging
+import unittest
+import src.utils.logging as queue_logging
+from src.utils.logging import setup_queue_logging
+
+
+class _ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+class TestQueueLogging(unittest.TestCase):
+    def test_records_reach_root_handlers(self):
+        handler = _ListHandler()
+        root = logging.getLogger()
+        root.addHandler(handler)
+        try:
+            logger = setup_queue_logging("tests.queue_logging")
+            logger.setLevel(logging.INFO)
+            logger.info("built %s", "image")
+            queue_logging._listener.stop()  # Drains the queue
+            queue_logging._listener.start()
+        finally:
+            root.removeHandler(handler)
+        self.assertEqual([r.getMessage() for r in handler.records], ["built image"])
+
+    def test_setup_is_idempotent(self):
+        logger = setup_queue_logging("tests.queue_logging.idempotent")
+        setup_queue_logging("tests.queue_logging.idempotent")
+        self.assertEqual(len(logger.handlers), 1)
+        self.assertFalse(logger.propagate)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,24 @@
+import unittest
+import jwt
+from src.utils.security import SecurityUtils
+
+
+class TestSecurityUtils(unittest.TestCase):
+    def setUp(self):
+        self.security = SecurityUtils("test-client")
+
+    def test_access_token_decodes_with_pyjwt(self):
+        token = self.security.generate_access_token(expiration_minutes=5)
+        payload = jwt.decode(token, self.security.jwt_secret, algorithms=["HS256"])
+        self.assertEqual(payload["client_id"], "test-client")
+        self.assertEqual(payload["exp"] - payload["iat"], 300)
+        self.assertEqual(jwt.get_unverified_header(token), {"alg": "HS256", "typ": "JWT"})
+
+    def test_access_token_rejects_other_secret(self):
+        token = self.security.generate_access_token()
+        with self.assertRaises(jwt.InvalidSignatureError):
+            jwt.decode(token, SecurityUtils("test-client").jwt_secret, algorithms=["HS256"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,33 @@
+import re
+import unittest
+from src.templates import TemplateManager
+
+
+class TestDockerfileTemplates(unittest.TestCase):
+    def setUp(self):
+        template_manager = TemplateManager()
+        self.base_dockerfile = template_manager.render_template("base.dockerfile")
+        self.dockerfile = template_manager.render_template(
+            "dockerfile", base_image="docker-factory/base:abc123"
+        )
+
+    def test_base_installs_requirements_after_copying_them(self):
+        copy_requirements = re.search(r"^COPY requirements\.txt ", self.base_dockerfile, re.M)
+        pip_install = re.search(r"^RUN .*pip3? install .*-r requirements\.txt", self.base_dockerfile, re.M)
+        self.assertIsNotNone(copy_requirements)
+        self.assertIsNotNone(pip_install)
+        self.assertLess(copy_requirements.start(), pip_install.start())
+
+    def test_app_builds_from_base_without_installing(self):
+        # Code edits must never re-run the dependency install
+        self.assertTrue(self.dockerfile.startswith("FROM docker-factory/base:abc123\n"))
+        self.assertNotRegex(self.dockerfile, r"(?m)^RUN ")
+        self.assertRegex(self.dockerfile, r"(?m)^COPY app\.py ")
+
+    def test_no_whole_directory_copy(self):
+        for dockerfile in (self.base_dockerfile, self.dockerfile):
+            self.assertNotRegex(dockerfile, r"(?m)^COPY \. ")
+
+
+if __name__ == "__main__":
+    unittest.main()